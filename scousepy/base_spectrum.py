@@ -12,13 +12,19 @@ import numpy as np
 from .stage_1 import calc_rms
 
 class BaseSpectrum(object):
+
+    # Spectra are created for every pixel in the cube - slots avoid carrying a
+    # per-instance dictionary around
+    __slots__ = ('_index', '_coordinates', '_rms', '_model_parent',
+                 '_model_spatial', '_model_dud', '_models', '_model', '_flux')
+
     def __init__(self, coords, flux, idx=None, scouse=None):
         """
         Stores all the information regarding individual spectra
         """
 
         self._index = idx
-        self._coordinates = np.array(coords, dtype='int')
+        self._coordinates = np.asarray(coords, dtype='int')
         self._rms = get_rms(self, scouse, flux)
         self._model_parent = None
         self._model_spatial = None
@@ -94,6 +100,21 @@ class BaseSpectrum(object):
         """
         return self._decision
 
+    def __setstate__(self, state):
+        """
+        Restores a pickled spectrum. Files written before the introduction of
+        __slots__ store the attributes in an instance dictionary, these are
+        restored in the same way. Attributes that are derived from the stored
+        ones and are absent from older files (e.g. saa.indices_flat) are
+        recomputed when first accessed.
+        """
+        if isinstance(state, tuple):
+            dictstate, slotstate = state
+            state = dict(dictstate or {})
+            state.update(slotstate or {})
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     def __repr__(self):
         """
         Return a nice printable format for the object.
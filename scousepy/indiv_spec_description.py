@@ -13,7 +13,9 @@ from .saa_description import get_rms
 from .base_spectrum import BaseSpectrum
 
 class spectrum(BaseSpectrum):
-    
+
+    __slots__ = ('_decision',)
+
     def __init__(self, *args, **kwargs):
         super(spectrum, self).__init__(*args, **kwargs)
 
@@ -336,6 +336,19 @@ def create_modelcube(self, njobs=1, verbose=True):
 
     return SpectralCube(data=_modelcube, wcs=_cube.wcs)
 
+_recreate_model = None
+
+def _get_recreate_model():
+    """
+    Returns recreate_model from stage_5. stage_5 cannot be imported at the top
+    of this module (circular import), so it is imported the first time it is
+    needed and cached, rather than on every call to genmodel.
+    """
+    global _recreate_model
+    if _recreate_model is None:
+        from .stage_5 import recreate_model as _recreate_model
+    return _recreate_model
+
 def genmodel(inputs):
     """
     generates the model for the creation of the model cube
@@ -344,7 +357,7 @@ def genmodel(inputs):
     spectrum = self.indiv_dict[key]
     bfmodel = spectrum.model
     if bfmodel.ncomps>0:
-        from .stage_5 import recreate_model
+        recreate_model = _get_recreate_model()
         mod,res = recreate_model(self, spectrum, bfmodel)
         totmod = np.nansum(mod, axis=1)
     else:
@@ -89,11 +89,19 @@ def run_tasks(procs, err_q, out_q, num):
     idx, result = out_q.get()
     results[idx] = result
 
-  try:
-      # Remove extra dimension added by array_split
-      return list(numpy.concatenate(results))
-  except ValueError:
-      return list(results)
+  # A process that died without reporting an exception (e.g. killed by the
+  # OS) leaves its slot empty - fail rather than return incomplete results
+  missing = [idx for idx, result in enumerate(results) if result is None]
+  if missing:
+    raise RuntimeError("parallel_map: no results were returned by "
+                       "process(es) {0}".format(missing))
+
+  # The sequence was dealt out to the processes cyclically (see
+  # parallel_map) - interleave the results to restore the input order
+  merged = [None]*sum(len(result) for result in results)
+  for idx, result in enumerate(results):
+    merged[idx::num] = result
+  return merged
 
 
 def parallel_map(function, sequence, numcores=None):
@@ -144,8 +152,13 @@ def parallel_map(function, sequence, numcores=None):
     log.info("Reduced number of cores to {0}".format(size))
     numcores = size
 
-  # group sequence into numcores-worth of chunks
-  sequence = numpy.array_split(sequence, numcores)
+  # group sequence into numcores-worth of chunks. Entries are dealt out
+  # cyclically rather than in contiguous blocks: neighbouring entries tend to
+  # cost a similar amount (e.g. adjacent spectra in a cube), so this spreads
+  # the expensive ones across all processes rather than leaving a single
+  # process to work through a block of them. The sequence is sliced directly
+  # so that entries holding arrays are not coerced into a single numpy array
+  sequence = [sequence[ii::numcores] for ii in range(numcores)]
 
   procs = [multiprocessing.Process(target=worker,
            args=(function, ii, chunk, out_q, err_q, lock))
@@ -9,12 +9,16 @@ CONTACT: henshaw@mpia.de
 """
 
 import numpy as np
+from itertools import chain
 from astropy.stats import median_absolute_deviation
 
 from .base_spectrum import BaseSpectrum, get_rms
 
 class saa(BaseSpectrum):
 
+    __slots__ = ('_ytrim', '_indices', '_indices_flat', '_indiv_spectra',
+                 '_sample', '_cube_shape')
+
     def __init__(self, coords, flux, idx=None, scouse=None, sample=False):
         """
         Stores all the information regarding individual spectral averaging areas
@@ -23,6 +27,7 @@ class saa(BaseSpectrum):
         super(saa, self).__init__(coords, flux, idx=idx, scouse=scouse)
         self._ytrim = trim_spectrum(self, scouse, flux)
         self._indices = None
+        self._indices_flat = None
         self._indiv_spectra = None
         self._sample = sample
         self._cube_shape = scouse.cube.shape
@@ -57,7 +62,18 @@ class saa(BaseSpectrum):
         Returns the flattened individual indices contained within the spectral
         averaging area.
         """
-        return np.ravel_multi_index(self.indices.T, self._cube_shape[1:])
+        # The flattened indices are accessed repeatedly during stage 3 -
+        # compute them on first access only. SAAs restored from stage files
+        # written before they were cached do not carry the attribute at all.
+        # The coordinates are passed as contiguous 1D arrays rather than
+        # strided columns of _indices.
+        if getattr(self, '_indices_flat', None) is None and \
+           self._indices is not None:
+            rows = np.ascontiguousarray(self._indices[:,0])
+            cols = np.ascontiguousarray(self._indices[:,1])
+            self._indices_flat = np.ravel_multi_index((rows, cols),
+                                                      self._cube_shape[1:])
+        return self._indices_flat
 
     @property
     def to_be_fit(self):
@@ -98,7 +114,9 @@ def add_ids(self, ids):
     """
     Adds indices contained within the SAA
     """
-    self._indices = np.array(ids, dtype='int')
+    self._indices = np.asarray(ids, dtype=np.intp)
+    # reset the flattened indices - recomputed on access (see indices_flat)
+    self._indices_flat = None
 
 def add_indiv_spectra(self, dict):
     """
@@ -110,12 +128,7 @@ def merge_models(self, merge_spec):
     """
     Merges merge_spec models into self
     """
-    main_models = self.models
-    merge_models = merge_spec.models
-    allmodels = []
-    allmodels.append(main_models)
-    allmodels.append(merge_models)
-    self._models = [model for mergemods in allmodels for model in mergemods]
+    self._models = list(chain(self.models, merge_spec.models))
 
 def clean_up(self):
     """
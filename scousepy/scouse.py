@@ -561,8 +561,15 @@ class scouse(object):
         if verbose:
             progress_bar = print_to_terminal(stage='s3', step='start')
 
+        # Select the SAAs that are to be fit once, only these are carried
+        # through stage 3
+        saas_to_fit = {}
+        for i in range(len(self.wsaa)):
+            saas_to_fit[i] = get_saas_to_fit(self.saa_dict[i])
+
         # Begin by preparing the spectra and adding them to the relevant SAA
-        initialise_indiv_spectra(self, verbose=verbose, njobs=njobs)
+        initialise_indiv_spectra(self, saas_to_fit, verbose=verbose,
+                                 njobs=njobs)
 
         key_set = []
         # Cycle through potentially multiple wsaa values
@@ -571,13 +578,13 @@ class scouse(object):
             saa_dict = self.saa_dict[i]
             indiv_dictionaries[i] = {}
             # Fit the spectra
-            fit_indiv_spectra(self, saa_dict, self.wsaa[i], njobs=njobs,
+            fit_indiv_spectra(self, saas_to_fit[i], self.wsaa[i], njobs=njobs,
                               spatial=spatial, verbose=verbose)
 
 
             # Compile the spectra
             indiv_dict = indiv_dictionaries[i]
-            _key_set = compile_spectra(self, saa_dict, indiv_dict,
+            _key_set = compile_spectra(self, saas_to_fit[i], indiv_dict,
                                        self.wsaa[i], spatial=spatial,
                                        verbose=verbose)
             # Clean things up a bit
@@ -946,18 +953,20 @@ class scouse(object):
             block_dict={}
             # cycle through all the blocks
             for blocknum in self.check_block_indices:
-                # create an empty spectrum
-                spec = np.zeros(self.cube.shape[0])
                 # get all of the individual pixel indices contained within that
                 # block
                 block_indices = get_block_indices(self, blocknum)
                 # turn the flattened indices into 2D indices such that we can
                 # find the spectra in the cube
                 coords = gen_2d_coords(self,block_indices)
+                # extract the spectra contained within the block - these are
+                # used for both the pseudo-SAA and the individual spectra
+                spectra = get_block_spectra(self, coords)
                 # create an SAA
-                SAA = gen_pseudo_SAA(self, coords, block_dict, blocknum, spec)
+                SAA = gen_pseudo_SAA(self, coords, block_dict, blocknum,
+                                     spectra)
                 # prepare the spectra for fitting
-                initialise_indiv_spectra_s6(self, SAA, njobs)
+                initialise_indiv_spectra_s6(self, SAA, njobs, spectra)
                 # Manual fitting of the blocks
                 manually_fit_blocks(self, block_dict, blocknum)
                 self.blockcount+=1
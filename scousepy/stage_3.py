@@ -16,17 +16,35 @@ import matplotlib.pyplot as plt
 import itertools
 import time
 
+from functools import partial
+
 from astropy import log
 from astropy import units as u
 from astropy.utils.console import ProgressBar
 
 from .indiv_spec_description import *
 from .parallel_map import *
-from .saa_description import add_indiv_spectra, clean_up, merge_models
+from .saa_description import add_indiv_spectra, clean_up, merge_models, \
+                              trim_spectrum
 from .solution_description import fit, print_fit_information
 from .verbose_output import print_to_terminal
 
-def initialise_indiv_spectra(scouseobject, verbose=False, njobs=1):
+def get_saas_to_fit(saa_dict):
+    """
+    Returns a list of the SAAs that are to be fit. Only these are carried
+    through the automated fitting, such that the remaining SAAs (e.g. those
+    not selected for the training set) are never revisited.
+
+    Parameters
+    ----------
+    saa_dict : dictionary
+        dictionary of spectral averaging areas
+
+    """
+    return [SAA for SAA in saa_dict.values() if SAA.to_be_fit]
+
+def initialise_indiv_spectra(scouseobject, saas_to_fit, verbose=False,
+                             njobs=1):
     """
     Here, the individual spectra are primed ready for fitting. We create a new
     object for each spectrum and they are contained within a dictionary which
@@ -35,6 +53,9 @@ def initialise_indiv_spectra(scouseobject, verbose=False, njobs=1):
     Parameters
     ----------
     scouseobject : Instance of the scousepy class
+    saas_to_fit : dictionary
+        for each wsaa, the list of SAAs that are to be fit (see
+        get_saas_to_fit)
     verbose : bool (optional)
         verbose output
     njobs : number (optional)
@@ -42,72 +63,98 @@ def initialise_indiv_spectra(scouseobject, verbose=False, njobs=1):
 
     """
 
+    # Extract the data from the cube once - the spectra contained within each
+    # SAA are then gathered from this array rather than slicing the cube one
+    # pixel at a time. The data are stored with shape (ny*nx, nchan) such that
+    # each spectrum is a contiguous row. Single precision is sufficient for the
+    # fitting and halves the memory that has to be moved around. The array is
+    # filled one channel at a time such that a full (float64) copy of the cube
+    # is never held in memory alongside it.
+    nchan = scouseobject.cube.shape[0]
+    cube_data = np.empty((np.prod(scouseobject.cube.shape[1:]), nchan),
+                         dtype=np.float32)
+    for chan in range(nchan):
+        cube_data[:, chan] = \
+            scouseobject.cube.unitless_filled_data[chan].ravel()
+
     # Cycle through potentially multiple wsaa values
     for i in range(len(scouseobject.wsaa)):
-        # Get the relavent SAA dictionary
-        saa_dict = scouseobject.saa_dict[i]
+        # Get the relavent list of SAAs
+        saa_list = saas_to_fit[i]
         # initialise the progress bar
         if verbose:
             count=0
             progress_bar = print_to_terminal(stage='s3', step='init',
-                                             length=len(saa_dict.keys()),
+                                             length=len(saa_list),
                                              var=scouseobject.wsaa[i])
 
-        for _key in saa_dict.keys():
-            prep_spec(_key, saa_dict, njobs, scouseobject)
+        for SAA in saa_list:
+            prep_spec(SAA, njobs, scouseobject, cube_data)
             if verbose:
                 progress_bar.update()
     if verbose:
         print("")
 
-def prep_spec(_key, saa_dict, njobs, scouseobject):
+def prep_spec(SAA, njobs, scouseobject, cube_data):
     """
     Prepares the spectra for automated fitting
 
     Parameters
     ----------
-    _key : number
-        key for SAA dictionary entry - used to select the correct SAA
-    saa_dict : dictionary
-        dictionary of spectral averaging areas
+    SAA : Instance of the saa class
+        scousepy spectral averaging area - this should be one that is to be
+        fit
     njobs : number
         number of cores used for the computation - prep spec is parallelised
     scouseobject : Instance of the scousepy class
+    cube_data : ndarray
+        unitless data extracted from the cube, of shape (ny*nx, nchan)
 
     """
 
-    # get the relavent SAA
-    SAA = saa_dict[_key]
     # Initialise indiv spectra
     indiv_spectra = {}
-    # We only care about the SAA's that are to be fit at this stage
-    if SAA.to_be_fit:
-        if np.size(SAA.indices_flat) != 0.0:
+    if np.size(SAA.indices_flat) != 0.0:
+        # Gather all of the spectra contained within the SAA in one go. Each
+        # spectrum takes a copy of its row such that it does not keep the
+        # array of the whole SAA alive.
+        spectra = get_saa_spectra(cube_data, SAA)
+        inputs = [[key, coords, np.array(flux), scouseobject] for key, coords,
+                  flux in zip(SAA.indices_flat, SAA.indices, spectra)]
 
-            # Parallel
-            if njobs > 1:
-                args = [scouseobject, SAA]
-                inputs = [[k] + args for k in range(len(SAA.indices_flat))]
-                # Send to parallel_map
-                indiv_spec = parallel_map(get_indiv_spec,inputs,numcores=njobs)
-                # flatten the output from parallel map
-                merged_spec = [spec for spec in indiv_spec if spec is not None]
-                merged_spec = np.asarray(merged_spec)
-                for k in range(len(SAA.indices_flat)):
-                    # Add the spectra to the dict
-                    key = SAA.indices_flat[k]
-                    indiv_spectra[key] = merged_spec[k]
-            else:
-                for k in range(len(SAA.indices_flat)):
-                    key = SAA.indices_flat[k]
-                    args = [scouseobject, SAA]
-                    inputs = [[k] + args]
-                    inputs = inputs[0]
-                    indiv_spec = get_indiv_spec(inputs)
-                    indiv_spectra[key] = indiv_spec
+        # Parallel
+        if njobs > 1:
+            # Send to parallel_map
+            indiv_spec = parallel_map(get_indiv_spec,inputs,numcores=njobs)
+            # Add the spectra to the dict - parallel_map preserves the order of
+            # the inputs so the output can be paired with the keys directly
+            for key, spec in zip(SAA.indices_flat, indiv_spec):
+                indiv_spectra[key] = spec
+        else:
+            for k in range(len(SAA.indices_flat)):
+                key = SAA.indices_flat[k]
+                indiv_spec = get_indiv_spec(inputs[k])
+                indiv_spectra[key] = indiv_spec
     # add the spectra to the spectral averaging areas
     add_indiv_spectra(SAA, indiv_spectra)
 
+def get_saa_spectra(cube_data, SAA):
+    """
+    Returns all of the spectra contained within an SAA as a single contiguous
+    array of shape (npix, nchan).
+
+    Parameters
+    ----------
+    cube_data : ndarray
+        unitless data extracted from the cube, of shape (ny*nx, nchan)
+    SAA : Instance of the saa class
+        scousepy spectral averaging area
+
+    """
+    # The rows of cube_data are the spectra - gathering them with the (cached)
+    # flattened indices gives the contiguous array in a single copy
+    return np.take(cube_data, SAA.indices_flat, axis=0)
+
 def get_indiv_spec(inputs):
     """
     Returns a spectrum
@@ -115,22 +162,18 @@ def get_indiv_spec(inputs):
     Parameters
     ----------
     inputs : list
-        list containing inputs to parallel map - contains the index of the
-        relavent spectrum, the scouseobject, and the SAA
+        list containing inputs to parallel map - contains the flattened index
+        of the relavent spectrum, its coordinates, its flux, and the
+        scouseobject
 
     """
-    idx, scouseobject, SAA = inputs
-    # get the coordinates of the pixel based on the flattened index
-    _coords = np.unravel_index(SAA.indices_flat[idx],scouseobject.cube.shape[1:])
+    key, coords, flux, scouseobject = inputs
     # create a pyspeckit spectrum
-    indiv_spec = spectrum(_coords, \
-                          scouseobject.cube[:,_coords[0], _coords[1]].value, \
-                          idx=SAA.indices_flat[idx], \
-                          scouse=scouseobject)
+    indiv_spec = spectrum(coords, flux, idx=key, scouse=scouseobject)
 
     return indiv_spec
 
-def fit_indiv_spectra(scouseobject, saa_dict, wsaa, njobs=1,
+def fit_indiv_spectra(scouseobject, saas_to_fit, wsaa, njobs=1,
                       spatial=False, verbose=False, stage=3):
     """
     Automated fitting procedure for individual spectra
@@ -138,8 +181,8 @@ def fit_indiv_spectra(scouseobject, saa_dict, wsaa, njobs=1,
     Parameters
     ----------
     scouseobject : Instance of the scousepy class
-    saa_dict : dictionary
-        dictionary of spectral averaging areas
+    saas_to_fit : list
+        list of the spectral averaging areas that are to be fit
     wsaa : number
         width of the SAA
     njobs : number (optional)
@@ -155,84 +198,78 @@ def fit_indiv_spectra(scouseobject, saa_dict, wsaa, njobs=1,
     if verbose:
         if stage == 3:
             progress_bar = print_to_terminal(stage='s3', step='fitting',
-                                             length=len(saa_dict.keys()),
+                                             length=len(saas_to_fit),
                                              var=wsaa)
         else:
             progress_bar = print_to_terminal(stage='s6', step='fitting',
-                                             length=len(saa_dict.keys()),
+                                             length=len(saas_to_fit),
                                              var=wsaa)
 
-    for _key in saa_dict.keys():
-        fitting_spec(_key, scouseobject, saa_dict, wsaa, njobs, spatial)
+    # Shhh
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        old_log = log.level
+        log.setLevel('ERROR')
+        # Generate a template spectrum - this is shared by all SAAs, the data
+        # are replaced for every spectrum that is fit
+        template_spectrum = generate_template_spectrum(scouseobject)
+
+        log.setLevel(old_log)
+
+    for SAA in saas_to_fit:
+        fitting_spec(SAA, scouseobject, wsaa, njobs, spatial,
+                     template_spectrum)
         if verbose:
             progress_bar.update()
 
     if verbose:
         print("")
 
-def fitting_spec(_key, scouseobject, saa_dict, wsaa, njobs, spatial):
+def fitting_spec(SAA, scouseobject, wsaa, njobs, spatial, template_spectrum):
     """
     The automated fitting process followed by scouse
 
     Parameters
     ----------
-    _key : number
-        key for SAA dictionary entry - used to select the correct SAA
+    SAA : Instance of the saa class
+        scousepy spectral averaging area - this should be one that is to be
+        fit
     scouseobject : Instance of the scousepy class
-    saa_dict : dictionary
-        dictionary of spectral averaging areas
     wsaa : number
         width of the SAA
     njobs : number
         number of cores used for the computation - prep spec is parallelised
     spatial : bool
         not implemented yet
+    template_spectrum : pyspeckit spectrum
+        dummy spectrum to be updated
     """
 
-    # get the relavent SAA
-    SAA = saa_dict[_key]
-
-    # We only care about those locations we have SAA fits for.
-    if SAA.to_be_fit:
-
-        # Shhh
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore')
-            old_log = log.level
-            log.setLevel('ERROR')
-            # Generate a template spectrum
-            template_spectrum = generate_template_spectrum(scouseobject)
+    # Get the SAA model solution
+    parent_model = SAA.model
 
-            log.setLevel(old_log)
-
-        # Get the SAA model solution
-        parent_model = SAA.model
-
-        # Parallel
-        if njobs > 1:
-            if np.size(SAA.indices_flat) != 0.0:
-                args = [scouseobject, SAA, parent_model, template_spectrum]
-                inputs = [[k] + args for k in range(len(SAA.indices_flat))]
-                # Send to parallel_map
-                bfs = parallel_map(fit_a_spectrum, inputs, numcores=njobs)
-                merged_bfs = [core_bf for core_bf in bfs if core_bf is not None]
-                merged_bfs = np.asarray(merged_bfs)
-
-                for k in range(len(SAA.indices_flat)):
-                    # Add the models to the spectra
-                    key = SAA.indices_flat[k]
-                    add_model_parent(SAA.indiv_spectra[key], merged_bfs[k,0])
-                    add_model_dud(SAA.indiv_spectra[key], merged_bfs[k,1])
-        else:
-            # If njobs = 1 just cycle through
-            for k in range(len(SAA.indices_flat)):
-                key = SAA.indices_flat[k]
-                args = [scouseobject, SAA, parent_model, template_spectrum]
-                inputs = [[k] + args]
-                inputs = inputs[0]
-                bfs = fit_a_spectrum(inputs)
-                add_model_parent(SAA.indiv_spectra[key], bfs[0])
-                add_model_dud(SAA.indiv_spectra[key], bfs[1])
+    # Parallel
+    if njobs > 1:
+        if np.size(SAA.indices_flat) != 0.0:
+            # Bind the arguments shared by every spectrum in the SAA once,
+            # such that only the keys are distributed between the cores
+            fitter = partial(fit_a_spectrum, scouseobject=scouseobject,
+                             SAA=SAA, parent_model=parent_model,
+                             template_spectrum=template_spectrum)
+            # Send to parallel_map
+            bfs = parallel_map(fitter, SAA.indices_flat, numcores=njobs)
+            # Add the models to the spectra - the output of parallel_map
+            # is in the same order as the inputs
+            for key, (bf, dud) in zip(SAA.indices_flat, bfs):
+                add_model_parent(SAA.indiv_spectra[key], bf)
+                add_model_dud(SAA.indiv_spectra[key], dud)
+    else:
+        # If njobs = 1 just cycle through
+        for key in SAA.indices_flat:
+            bfs = fit_a_spectrum(key, scouseobject, SAA, parent_model,
+                                 template_spectrum)
+            add_model_parent(SAA.indiv_spectra[key], bfs[0])
+            add_model_dud(SAA.indiv_spectra[key], bfs[1])
 
 def generate_template_spectrum(scouseobject):
     """
@@ -289,30 +326,35 @@ def get_spec(scouseobject, indiv_spec, template_spectrum):
     template_spectrum : pyspeckit spectrum
         dummy spectrum to be updated
     """
-    y = get_flux(scouseobject, indiv_spec)
-    rms=indiv_spec.rms
+    # The spectrum already holds its flux (gathered from the cube during
+    # prep_spec) - trim that rather than slicing the cube again
+    y = trim_spectrum(indiv_spec, scouseobject, np.asarray(indiv_spec.flux))
+    err = np.full(len(y), indiv_spec.rms, dtype=float)
 
-    template_spectrum.data = u.Quantity(y).value
-    template_spectrum.error = u.Quantity(np.ones(len(y))*rms).value
-    template_spectrum.specfit.spectofit = u.Quantity(y).value
-    template_spectrum.specfit.errspec = u.Quantity(np.ones(len(y))*rms).value
+    template_spectrum.data = y
+    template_spectrum.error = err
+    template_spectrum.specfit.spectofit = y.copy()
+    template_spectrum.specfit.errspec = err.copy()
 
     return template_spectrum
 
-def fit_a_spectrum(inputs):
+def fit_a_spectrum(key, scouseobject, SAA, parent_model, template_spectrum):
     """
     Process used for fitting spectra. Returns a best-fit solution and a dud for
     every spectrum.
 
     Parameters
     ----------
-    inputs : list
-        list containing inputs to parallel map - contains the spectrum index,
-        the scouseobject, SAA, the best-fitting model solution to the SAA, and
-        the template spectrum
+    key : number
+        index of the individual spectrum
+    scouseobject : Instance of the scousepy class
+    SAA : Instance of the saa class
+        scousepy spectral averaging area
+    parent_model : instance of the fit class
+        best-fitting model solution to the parent SAA
+    template_spectrum : pyspeckit spectrum
+        dummy spectrum to be updated
     """
-    idx, scouseobject, SAA, parent_model, template_spectrum = inputs
-    key = SAA.indices_flat[idx]
     spec=None
 
     # Shhh
@@ -324,6 +366,13 @@ def fit_a_spectrum(inputs):
         spec = get_spec(scouseobject, SAA.indiv_spectra[key], template_spectrum)
         log.setLevel(old_log)
 
+    # Spectra containing non-finite values (e.g. masked pixels) cannot be fit.
+    # Skip the fitting process entirely and go straight to a dud.
+    if (not np.isfinite(SAA.indiv_spectra[key].rms)) or \
+       (not np.all(np.isfinite(np.array(spec.flux)))):
+        dud = fitting_process_duds(scouseobject, SAA, key, spec)
+        return [dud, dud]
+
     # begin the fitting process
     bf = fitting_process_parent(scouseobject, SAA, key, spec, parent_model)
     # if the result is a zero component fit, create a dud spectrum
@@ -349,6 +398,11 @@ def fitting_process_parent(scouseobject, SAA, key, spec, parent_model):
     parent_model : instance of the fit class
         best-fitting model solution to the parent SAA
 
+    Notes
+    -----
+    Spectra containing non-finite values are caught in fit_a_spectrum and
+    never reach this point.
+
     """
 
     # Check the model
@@ -356,41 +410,36 @@ def fitting_process_parent(scouseobject, SAA, key, spec, parent_model):
     initfit = True
     fit_dud = False
     while not happy:
-        if np.all(np.isfinite(np.array(spec.flux))):
-            if initfit:
-                guesses = np.asarray(parent_model.params)
-            if np.sum(guesses) != 0.0:
-                    with warnings.catch_warnings():
-                        warnings.simplefilter('ignore')
-                        old_log = log.level
-                        log.setLevel('ERROR')
-                        spec.specfit(interactive=False, \
-                                    clear_all_connections=True,\
-                                    xmin=scouseobject.ppv_vol[0], \
-                                    xmax=scouseobject.ppv_vol[1], \
-                                    fittype = scouseobject.fittype, \
-                                    guesses = guesses,\
-                                    verbose=False,\
-                                    use_lmfit=True)
-                        log.setLevel(old_log)
-
-                    modparnames = spec.specfit.fitter.parnames
-                    modncomps = spec.specfit.npeaks
-                    modparams = spec.specfit.modelpars
-                    moderrors = spec.specfit.modelerrs
-                    modrms = spec.error[0]
-
-                    _inputs = [modparnames, [modncomps], modparams, moderrors, [modrms]]
-                    happy, guesses = check_spec(scouseobject, parent_model, _inputs, happy)
-
-                    initfit = False
-            else:
-                # If no satisfactory model can be found - fit a dud!
-                fit_dud=True
-                happy = True
+        if initfit:
+            guesses = np.asarray(parent_model.params)
+        if np.sum(guesses) != 0.0:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                old_log = log.level
+                log.setLevel('ERROR')
+                spec.specfit(interactive=False, \
+                            clear_all_connections=True,\
+                            xmin=scouseobject.ppv_vol[0], \
+                            xmax=scouseobject.ppv_vol[1], \
+                            fittype = scouseobject.fittype, \
+                            guesses = guesses,\
+                            verbose=False,\
+                            use_lmfit=True)
+                log.setLevel(old_log)
+
+            modparnames = spec.specfit.fitter.parnames
+            modncomps = spec.specfit.npeaks
+            modparams = spec.specfit.modelpars
+            moderrors = spec.specfit.modelerrs
+            modrms = spec.error[0]
+
+            _inputs = [modparnames, [modncomps], modparams, moderrors, [modrms]]
+            happy, guesses = check_spec(scouseobject, parent_model, _inputs, happy)
+
+            initfit = False
         else:
             # If no satisfactory model can be found - fit a dud!
-            fit_dud = True
+            fit_dud=True
             happy = True
 
     if fit_dud:
@@ -792,7 +841,7 @@ def find_closest_match(i, nparams, ncomponents, params, parent_model):
 
     return diff
 
-def compile_spectra(scouseobject, saa_dict, indiv_dict, wsaa,
+def compile_spectra(scouseobject, saas_to_fit, indiv_dict, wsaa,
                     spatial=False, verbose=False):
     """
     Here we compile all best-fitting models into a single dictionary.
@@ -800,8 +849,8 @@ def compile_spectra(scouseobject, saa_dict, indiv_dict, wsaa,
     Parameters
     ----------
     scouseobject : Instance of the scousepy class
-    saa_dict : dictionary
-        dictionary of spectral averaging areas
+    saas_to_fit : list
+        list of the spectral averaging areas that have been fit
     indiv_dict : dictionary
         dictionary containing the individual spectra
     wsaa : number
@@ -819,59 +868,36 @@ def compile_spectra(scouseobject, saa_dict, indiv_dict, wsaa,
     key_list = []
     model_list = []
 
-    for _key in saa_dict.keys():
-        # get the relavent SAA
-        SAA = saa_dict[_key]
-        if SAA.to_be_fit:
-            indiv_spectra = SAA.indiv_spectra
-            if np.size(indiv_spectra) != 0:
-                for key in indiv_spectra.keys():
-                    key_list.append(key)
-                    model_list.append(indiv_spectra[key])
+    for SAA in saas_to_fit:
+        indiv_spectra = SAA.indiv_spectra
+        if np.size(indiv_spectra) != 0:
+            for key in indiv_spectra.keys():
+                key_list.append(key)
+                model_list.append(indiv_spectra[key])
 
     if not key_list:
         # if it's empty, we have a problem
         raise ValueError(colors.fg._red_+"Empty key list found; the SAA has no"+
                          " entries."+colors._endc_)
 
-    # sort the lists
     key_arr = np.array(key_list)
-    model_arr = np.array(model_list)
-    sortidx = argsort(key_list)
-    key_arr = key_arr[sortidx]
-    model_arr = model_arr[sortidx]
-
-    # Cycle through all the spectra
-    for key in range(scouseobject.cube.shape[1]*scouseobject.cube.shape[2]):
-
-        # Find all instances of key in the key_arr
-        model_idxs = np.squeeze(np.where(key_arr == key))
-        # If there is a solution available
-        if np.size(model_idxs) > 0:
-            # If there is only one instance of this spectrum being fit - we can
-            # add it to the dictionary straight away
-            if np.size(model_idxs) == 1:
-                _spectrum = model_arr[model_idxs]
-                model_list = []
-                model_list = get_model_list(model_list, _spectrum, spatial)
-                update_model_list(_spectrum, model_list)
-                indiv_dict[key] = _spectrum
-            else:
-                # if not, we have to compile the solutions into a single object
-                # Take the first one
-                _spectrum = model_arr[model_idxs[0]]
-                model_list = []
-                model_list = get_model_list(model_list, _spectrum, spatial)
-                # Now cycle through the others
-                for i in range(1, np.size(model_idxs)):
-                    _spec = model_arr[model_idxs[i]]
-                    model_list = get_model_list(model_list, _spec, spatial)
-                # So now the model list should contain every single model
-                # solution that is available from all spectral averaging areas
-                # Update the model list of the first spectrum and then update
-                # the dictionary
-                update_model_list(_spectrum, model_list)
-                indiv_dict[key] = _spectrum
+
+    # Group the spectra by key. A single (stable) sort places all instances of
+    # a given key next to each other, the boundaries of each group can then be
+    # located with searchsorted. This avoids searching the full key_arr for
+    # every pixel in the cube.
+    order = np.argsort(key_arr, kind='stable')
+    sorted_keys = key_arr[order]
+    unique_keys = np.unique(sorted_keys)
+    boundaries = np.searchsorted(sorted_keys, unique_keys, side='left')
+    boundaries = np.append(boundaries, len(key_arr))
+
+    # Cycle through all the spectra with a solution - only the slice of the
+    # sort order belonging to each key is passed on
+    for i, key in enumerate(unique_keys):
+        model_idxs = order[boundaries[i]:boundaries[i+1]]
+        indiv_dict[int(key)] = compilation_method(model_idxs, model_list,
+                                                  spatial=spatial)
 
     # this is the complete list of all spectra included in all dictionaries
     key_set = set(key_arr)
@@ -879,6 +905,35 @@ def compile_spectra(scouseobject, saa_dict, indiv_dict, wsaa,
 
     return key_set
 
+def compilation_method(model_idxs, model_list, spatial=False):
+    """
+    Compiles all model solutions available for a given spectrum into a single
+    object
+
+    Parameters
+    ----------
+    model_idxs : ndarray
+        indices of all instances of the spectrum within model_list. If the
+        spectrum has been fit as part of multiple SAAs there will be more than
+        one.
+    model_list : list
+        list containing the individual spectra from all SAAs
+    spatial : bool (optional)
+        not implemented yet
+
+    """
+    # Take the first instance - this is the spectrum that is updated
+    _spectrum = model_list[model_idxs[0]]
+    spectrum_models = []
+    # Cycle through all instances such that the model list contains every
+    # single model solution that is available from all SAAs
+    for idx in model_idxs:
+        spectrum_models = get_model_list(spectrum_models, model_list[idx],
+                                         spatial)
+    update_model_list(_spectrum, spectrum_models)
+
+    return _spectrum
+
 def compile_key_sets(scouseobject, key_set):
     """
     Returns unqiue keys
@@ -920,29 +975,19 @@ def merge_dictionaries(scouseobject, indiv_dictionaries, spatial=False, verbose=
     main_dict={}
     if len(scouseobject.wsaa)>1:
         for key in scouseobject.key_set:
-            # Search dictionaries for found keys
-            keyfound = np.zeros(len(scouseobject.wsaa), dtype='bool')
-            for i in range(len(indiv_dictionaries.keys())):
-                if key in indiv_dictionaries[i]:
-                    keyfound[i] = True
-
-            idx = np.where(keyfound==True)[0]
-            main_dict[key] = indiv_dictionaries[idx[0]][key]
-            if np.size(idx) == 1:
-                idx = []
-            else:
-                idx = list(idx)
-                idx.remove(idx[0])
+            # Collect the spectrum from every dictionary in which the key is
+            # found (in wsaa order)
+            found = [indiv_dictionaries[i][key]
+                     for i in range(len(indiv_dictionaries.keys()))
+                     if key in indiv_dictionaries[i]]
 
             # Get the main spectrum
-            main_spectrum = main_dict[key]
+            main_spectrum = found[0]
+            main_dict[key] = main_spectrum
 
             # Merge spectra from other dictionaries into main_dict
-            if np.size(idx) != 0:
-                for i in idx:
-                    dictionary = indiv_dictionaries[i]
-                    _spectrum = dictionary[key]
-                    merge_models(main_spectrum, _spectrum)
+            for _spectrum in found[1:]:
+                merge_models(main_spectrum, _spectrum)
 
         # Return this new dictionary
         scouseobject.indiv_dict = main_dict
@@ -964,24 +1009,36 @@ def remove_duplicates(scouseobject, verbose):
     if verbose:
         progress_bar = print_to_terminal(stage='s3', step='duplicates', length=0)
 
-    for key in scouseobject.indiv_dict.keys():
-        # get the spectrum
-        _spectrum = scouseobject.indiv_dict[key]
+    spectra = list(scouseobject.indiv_dict.values())
+
+    # extract the aic values of all models of all spectra in one go. offsets
+    # marks where the models of each spectrum begin and end in aic_all.
+    nmodels = [len(_spectrum.models) for _spectrum in spectra]
+    offsets = np.cumsum([0]+nmodels)
+    aic_all = np.fromiter((model.aic for _spectrum in spectra
+                           for model in _spectrum.models),
+                          dtype=float, count=offsets[-1])
+
+    # aic values are compared to 2 decimal places. Rather than rounding and
+    # comparing floats, convert them to integer keys in units of 0.01 - this
+    # makes the search for unique values a cheaper integer sort. Non-finite
+    # values share a single sentinel key.
+    finite = np.isfinite(aic_all)
+    aic_keys = np.full(np.size(aic_all), np.iinfo(np.int64).max,
+                       dtype=np.int64)
+    aic_keys[finite] = np.rint(aic_all[finite]*100.)
+
+    for i, _spectrum in enumerate(spectra):
         # get the models
         models = _spectrum.models
 
-        # extract aic values and identify unique values
-        aiclist = []
-        for i in range(len(models)):
-            aiclist.append(models[i].aic)
-        aicarr = np.asarray(aiclist)
-        aicarr = np.around(aicarr, decimals=2)
+        # identify unique aic values
+        aicarr = aic_keys[offsets[i]:offsets[i+1]]
         uniqvals, uniqids = np.unique(aicarr, return_index=True)
-        models = np.asarray(models)
-        uniqmodels = models[uniqids]
+        # select the unique models straight from the model list
+        uniqmodels = [models[j] for j in uniqids]
 
         # update list with only unique aic entries
-        uniqmodels = list(uniqmodels)
         update_model_list_remdup(_spectrum, uniqmodels)
 
 def get_model_list(model_list, _spectrum, spatial=False):
@@ -16,7 +16,8 @@ from matplotlib import pyplot
 from matplotlib.patches import Rectangle
 
 from .stage_2 import *
-from .stage_3 import get_flux, get_indiv_spec, fit_indiv_spectra
+from .stage_3 import get_flux, get_indiv_spec, get_saas_to_fit, \
+                     fit_indiv_spectra
 from .stage_5 import *
 
 Fitter = Stage2Fitter()
@@ -90,16 +91,22 @@ def gen_2d_coords(scouseobject,block_indices):
     coords = np.asarray(coords)
     return coords
 
-def gen_pseudo_SAA(scouseobject, coords, block_dict, blocknum, spec):
+def get_block_spectra(scouseobject, coords):
+    """
+    Returns the spectra contained within a block as a single array of shape
+    (npix, nchan). Only the pixels within the block are extracted from the
+    cube.
+    """
+    return np.array([scouseobject.cube[:, ycrd, xcrd].value
+                     for ycrd, xcrd in coords])
+
+def gen_pseudo_SAA(scouseobject, coords, block_dict, blocknum, spectra):
     """
     Creates an SAA from a list of individual spectra
     """
 
     # Create spatially averaged spectrum
-    for ycrd, xcrd in coords:
-        indivspec = scouseobject.cube[:, ycrd, xcrd].value
-        spec[:] += indivspec
-    spec = spec/len(coords[:,0])
+    spec = np.sum(spectra, axis=0)/len(coords[:,0])
     # Create a pseudo-SAA
     SAA = saa([blocknum,blocknum], spec,
                idx=blocknum, sample=True, scouse=scouseobject)
@@ -108,30 +115,27 @@ def gen_pseudo_SAA(scouseobject, coords, block_dict, blocknum, spec):
 
     return SAA
 
-def initialise_indiv_spectra_s6(scouseobject, SAA, njobs):
+def initialise_indiv_spectra_s6(scouseobject, SAA, njobs, spectra):
     """
     Initialise the spectra for fitting
     """
     indiv_spectra = {}
+    # spectra are those extracted for the pseudo-SAA (see get_block_spectra).
+    # Each spectrum takes a copy of its row.
+    inputs = [[key, coords, np.array(flux), scouseobject] for key, coords, flux
+              in zip(SAA.indices_flat, SAA.indices, spectra)]
     # Parallel
     if njobs > 1:
-        args = [scouseobject, SAA]
-        inputs = [[k] + args for k in range(len(SAA.indices_flat))]
         # Send to parallel_map
         indiv_spec = parallel_map(get_indiv_spec, inputs, numcores=njobs)
-        merged_spec = [spec for spec in indiv_spec if spec is not None]
-        merged_spec = np.asarray(merged_spec)
-        for k in range(len(SAA.indices_flat)):
-            # Add the spectra to the dict
-            key = SAA.indices_flat[k]
-            indiv_spectra[key] = merged_spec[k]
+        # Add the spectra to the dict - parallel_map preserves the order of
+        # the inputs so the output can be paired with the keys directly
+        for key, spec in zip(SAA.indices_flat, indiv_spec):
+            indiv_spectra[key] = spec
     else:
         for k in range(len(SAA.indices_flat)):
             key = SAA.indices_flat[k]
-            args = [scouseobject, SAA]
-            inputs = [[k] + args]
-            inputs = inputs[0]
-            indiv_spec = get_indiv_spec(inputs)
+            indiv_spec = get_indiv_spec(inputs[k])
             indiv_spectra[key] = indiv_spec
     add_indiv_spectra(SAA, indiv_spectra)
 
@@ -163,7 +167,7 @@ def auto_fit_blocks(scouseobject, block_dict, njobs, blocksize, verbose=False):
     """
     indiv_dictionary = {}
     # Fit the spectra
-    fit_indiv_spectra(scouseobject, block_dict, blocksize/3, \
+    fit_indiv_spectra(scouseobject, get_saas_to_fit(block_dict), blocksize/3, \
                       njobs=njobs, spatial=False, verbose=verbose, stage=6)
 
     for block_ind in scouseobject.check_block_indices:
@@ -0,0 +1,14 @@
+import pytest
+
+
+def square(x):
+    return x**2
+
+
+@pytest.mark.parametrize('numcores', [2, 3, 4])
+def test_parallel_map_order(numcores):
+    # the results must be returned in the order of the input sequence
+    from ..parallel_map import parallel_map
+    sequence = list(range(11))
+    result = parallel_map(square, sequence, numcores=numcores)
+    assert list(result) == [square(x) for x in sequence]
@@ -0,0 +1,27 @@
+import pickle
+
+import numpy as np
+
+
+def test_saa_legacy_state():
+    # stage files written before __slots__ store the SAA attributes in an
+    # instance dictionary and do not include the flattened indices
+    from ..saa_description import saa
+    indices = np.array([[1, 2], [3, 0], [2, 4]], dtype='int')
+    state = {'_index': 0, '_coordinates': np.array([2, 2]), '_rms': 0.1,
+             '_model_parent': None, '_model_spatial': None,
+             '_model_dud': None, '_models': None, '_model': None,
+             '_flux': np.zeros(10), '_ytrim': np.zeros(10),
+             '_indices': indices, '_indiv_spectra': None, '_sample': True,
+             '_cube_shape': (10, 4, 5)}
+
+    SAA = saa.__new__(saa)
+    SAA.__setstate__(state)
+
+    expected = np.ravel_multi_index(indices.T, (4, 5))
+    assert np.array_equal(SAA.indices_flat, expected)
+
+    # and the restored SAA survives a round trip through pickle
+    restored = pickle.loads(pickle.dumps(SAA))
+    assert np.array_equal(restored.indices, indices)
+    assert np.array_equal(restored.indices_flat, expected)